@@ -0,0 +1,80 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+
+class ContentCache:
+    """Persistent sqlite cache of values keyed by a content digest.
+
+    Entries are grouped by ``kind`` (e.g. ``'py'``, ``'js'``, ``'insights'``)
+    and tagged with a ``version``; an entry whose version differs from the
+    requested one is treated as a miss. Entries older than ``max_age`` seconds,
+    and the oldest ones beyond ``max_entries``, are pruned when the cache is
+    opened. Cache errors never propagate - a cache that cannot be opened or
+    queried simply behaves as if it were empty.
+    """
+
+    def __init__(self, path: str, max_entries: int = 200_000, max_age: float = 30 * 24 * 3600):
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                columns = [row[1] for row in conn.execute("PRAGMA table_info(cache)")]
+                if columns and 'inserted_at' not in columns:
+                    # Table from before entries were timestamped - it is only a cache
+                    conn.execute("DROP TABLE cache")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    "kind TEXT NOT NULL, key BLOB NOT NULL, version TEXT NOT NULL, value TEXT NOT NULL, "
+                    "inserted_at REAL NOT NULL, PRIMARY KEY (kind, key))"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS cache_inserted_at ON cache (inserted_at)")
+                conn.execute("DELETE FROM cache WHERE inserted_at < ?", (time.time() - max_age,))
+                conn.execute(
+                    "DELETE FROM cache WHERE inserted_at < ("
+                    "SELECT inserted_at FROM cache ORDER BY inserted_at DESC LIMIT 1 OFFSET ?)",
+                    (max_entries - 1,),
+                )
+            except sqlite3.Error:
+                conn.close()
+                raise
+        except sqlite3.Error:
+            return
+        self._conn = conn
+
+    def get(self, kind: str, key: bytes, version: str = '') -> Optional[Any]:
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT version, value FROM cache WHERE kind = ? AND key = ?", (kind, key)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or row[0] != version:
+            return None
+        return json.loads(row[1])
+
+    def set(self, kind: str, key: bytes, value: Any, version: str = '') -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (kind, key, version, value, inserted_at) VALUES (?, ?, ?, ?, ?)",
+                    (kind, key, version, json.dumps(value), time.time()),
+                )
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.close()
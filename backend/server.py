@@ -1,35 +1,98 @@
 from fastapi import FastAPI, APIRouter, HTTPException
 from dotenv import load_dotenv
+from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Dict, Any, Optional
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import time
 import tempfile
 import shutil
 import ast
+import hashlib
+import sys
 import json
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from git import Repo
+import re2
 from emergentintegrations.llm.chat import LlmChat, UserMessage
+from _import_cache import ContentCache
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# tz_aware so stored BSON dates come back as aware UTC datetimes
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
 
+# Persistent cache of parsed imports and AI insights, keyed by content hash
+import_cache = ContentCache(os.environ.get(
+    'ANALYSIS_CACHE_PATH',
+    os.path.join(tempfile.gettempdir(), 'repo_analyzer_cache.sqlite3')
+))
+
+# Model used for AI insights
+LLM_PROVIDER = "openai"
+LLM_MODEL = "gpt-4o-mini"
+
 # Create the main app without a prefix
 app = FastAPI()
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+# Files larger than this are not parsed for imports
+MAX_PARSE_SIZE = 1_000_000
+
+# File extensions to analyze
+CODE_EXTENSIONS = {'.py', '.js', '.jsx', '.ts', '.tsx', '.go', '.java'}
+
+# Number of source files listed in the AI insights prompt
+KEY_SOURCE_FILES = 10
+
+# File extensions parsed with the JS import regex
+JS_EXTENSIONS = {'.js', '.jsx', '.ts', '.tsx'}
+
+# Cached Python parse results are only valid for the same grammar and parser logic
+PY_PARSER_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}:2"
+
+# Directories never descended into during the walk (hidden ones are skipped too)
+SKIP_DIRS = frozenset({'node_modules', 'venv', '__pycache__', 'dist', 'build', '.git', '.venv', '.next', 'target'})
+
+# Files checked out from the clone: source code plus the manifests and
+# entry point files inspected by detect_framework/find_entry_points.
+# Other tracked files are still listed, from `git ls-tree`, without their blobs
+SPARSE_CHECKOUT_PATTERNS = [
+    '*.py', '*.js', '*.jsx', '*.ts', '*.tsx', '*.go', '*.java', '*.html',
+    'package.json', 'requirements.txt', 'go.mod', 'pom.xml', 'build.gradle'
+]
+
+# Common entry point files at the repository root
+COMMON_ENTRIES = [
+    'index.js', 'index.ts', 'index.jsx', 'index.tsx',
+    'main.py', 'app.py', 'server.py', 'manage.py',
+    'main.go', 'main.java', 'Main.java',
+    'index.html'
+]
+
+# Entry point files looked for directly under src/
+SRC_ENTRIES = ['index.js', 'index.ts', 'index.jsx', 'index.tsx', 'App.js', 'App.tsx', 'main.py', 'main.go']
+
+# Matches ES6 `import ... from '...'` and `require('...')` in a single pass.
+# Compiled with RE2: `[^;]*?` may run to the end of a file without
+# semicolons, which its linear-time engine handles where `re` goes quadratic.
+_JS_IMPORT_RE = re2.compile(r'''(?:import\s+[^;]*?from\s+|require\()\s*['"]([^'"]+)['"]''')
+
 # Define Models
 class AnalyzeRequest(BaseModel):
     github_url: str
@@ -55,59 +118,153 @@ class RepositoryAnalysis(BaseModel):
     ai_insights: Optional[str] = None
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+# Analyses of the same URL newer than this are served without re-analyzing
+ANALYSIS_TTL_SECONDS = 3600
+
+# In-process LRU of recent analyses: github_url -> (time.monotonic(), response payload)
+MAX_RECENT_ANALYSES = 32
+_recent_analyses: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+# Cached clones, one directory per repository URL, reused with `git fetch`
+CLONE_CACHE_DIR = Path(os.environ.get(
+    'CLONE_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'repo_analyzer_clones')
+))
+MAX_CACHED_CLONES = 32
+
+# Serializes analyses that share a cached clone: clone key -> [lock, holders and waiters].
+# Entries only exist while the lock is in use - see _clone_lock()
+_clone_locks: Dict[str, list] = {}
+
+# Fire-and-forget tasks, referenced so they are not garbage collected mid-run
+_background_tasks: set = set()
+
 # Helper functions
-def detect_framework(repo_path: Path) -> Optional[str]:
+def clone_repository(github_url: str, repo_path: Path) -> Repo:
+    """Shallow, blobless clone that only materializes the files the analysis reads"""
+    repo = Repo.clone_from(
+        github_url, repo_path,
+        multi_options=['--depth=1', '--filter=blob:none', '--sparse']
+    )
+    repo.git.sparse_checkout('set', '--no-cone', *SPARSE_CHECKOUT_PATTERNS)
+    return repo
+
+def clone_cache_key(github_url: str) -> str:
+    """Name of the cached clone directory for a repository URL"""
+    return hashlib.sha1(github_url.encode('utf-8')).hexdigest()
+
+def checkout_repository(github_url: str, repo_path: Path) -> Repo:
+    """Update the cached clone at repo_path to the latest commit, cloning it if missing"""
+    if (repo_path / '.git').is_dir():
+        try:
+            repo = Repo(repo_path)
+            repo.remotes.origin.fetch(depth=1)
+            repo.git.reset('--hard', 'origin/HEAD')
+            os.utime(repo_path)  # Mark as recently used for eviction
+            return repo
+        except Exception:
+            # Broken or diverged clone - start over
+            shutil.rmtree(repo_path, ignore_errors=True)
+    
+    repo_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        return clone_repository(github_url, repo_path)
+    except Exception:
+        shutil.rmtree(repo_path, ignore_errors=True)
+        raise
+
+def _stale_clone_keys() -> List[str]:
+    """Cached clones beyond MAX_CACHED_CLONES, least recently used first"""
+    try:
+        with os.scandir(CLONE_CACHE_DIR) as it:
+            clones = [(entry.stat().st_mtime, entry.name) for entry in it if entry.is_dir()]
+    except FileNotFoundError:
+        return []
+    clones.sort(reverse=True)
+    return [name for _, name in reversed(clones[MAX_CACHED_CLONES:])]
+
+@asynccontextmanager
+async def _clone_lock(clone_key: str):
+    """Hold the lock of a cached clone, dropping its entry once nobody holds or awaits it"""
+    entry = _clone_locks.setdefault(clone_key, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _clone_locks[clone_key]
+
+async def evict_stale_clones() -> None:
+    """Delete the least recently used cached clones beyond MAX_CACHED_CLONES"""
+    for clone_key in await asyncio.to_thread(_stale_clone_keys):
+        async with _clone_lock(clone_key):
+            await asyncio.to_thread(shutil.rmtree, CLONE_CACHE_DIR / clone_key, ignore_errors=True)
+
+def _run_in_background(coro) -> None:
+    """Schedule a coroutine without awaiting it, keeping a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+def _load_json(path: Path) -> Any:
+    """Load a JSON file with a single read"""
+    return json.loads(path.read_bytes())
+
+def _json_mapping(data: dict, key: str) -> dict:
+    """Return data[key] if it is a JSON object, else an empty dict"""
+    value = data.get(key) or {}
+    return value if isinstance(value, dict) else {}
+
+def _find_react(src_sources: List[str]) -> bool:
+    """Check whether any of the given source files mentions React near its top"""
+    for path in src_sources:
+        try:
+            with open(path, 'rb') as f:
+                head = f.read(256)  # Raw bytes - no decoding needed to spot 'react'
+        except:
+            continue
+        if b'react' in head.lower():
+            return True
+    return False
+
+def detect_framework(repo_path: Path, root_files: set, package_data: Optional[dict],
+                     src_sources: List[str]) -> Optional[str]:
     """Detect the framework used in the repository"""
     frameworks = []
     
     # Check for JavaScript frameworks via package.json
-    package_json = repo_path / "package.json"
-    if package_json.exists():
-        try:
-            with open(package_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                deps = {**data.get('dependencies', {}), **data.get('devDependencies', {})}
-                
-                # Check for Next.js first (superset of React)
-                if 'next' in deps:
-                    frameworks.append('Next.js')
-                # Check for React
-                elif 'react' in deps or 'react-dom' in deps:
-                    frameworks.append('React')
-                    
-                # Check for Vue
-                if 'vue' in deps:
-                    frameworks.append('Vue')
-                    
-                # Check for Angular
-                if 'angular' in deps or '@angular/core' in deps:
-                    frameworks.append('Angular')
-                    
-                # Check for Svelte
-                if 'svelte' in deps:
-                    frameworks.append('Svelte')
-        except Exception as e:
-            pass
+    if package_data is not None:
+        deps = {**_json_mapping(package_data, 'dependencies'), **_json_mapping(package_data, 'devDependencies')}
+        
+        # Check for Next.js first (superset of React)
+        if 'next' in deps:
+            frameworks.append('Next.js')
+        # Check for React
+        elif 'react' in deps or 'react-dom' in deps:
+            frameworks.append('React')
+            
+        # Check for Vue
+        if 'vue' in deps:
+            frameworks.append('Vue')
+            
+        # Check for Angular
+        if 'angular' in deps or '@angular/core' in deps:
+            frameworks.append('Angular')
+            
+        # Check for Svelte
+        if 'svelte' in deps:
+            frameworks.append('Svelte')
     
     # Check for React via src files if not found in package.json
-    if not frameworks:
-        src_dir = repo_path / "src"
-        if src_dir.exists():
-            for file in src_dir.rglob('*.js*'):
-                try:
-                    with open(file, 'r', encoding='utf-8') as f:
-                        content = f.read(100)  # Read first 100 chars
-                        if 'react' in content.lower() or 'import React' in content:
-                            frameworks.append('React')
-                            break
-                except:
-                    pass
+    if not frameworks and _find_react(src_sources):
+        frameworks.append('React')
     
     # Check for Python frameworks
-    requirements_txt = repo_path / "requirements.txt"
-    if requirements_txt.exists():
+    if 'requirements.txt' in root_files:
         try:
-            with open(requirements_txt, 'r') as f:
+            with open(repo_path / "requirements.txt", 'r') as f:
                 content = f.read().lower()
                 if 'django' in content:
                     frameworks.append('Django')
@@ -119,153 +276,259 @@ def detect_framework(repo_path: Path) -> Optional[str]:
             pass
     
     # Check for Go
-    if (repo_path / "go.mod").exists():
+    if 'go.mod' in root_files:
         frameworks.append('Go')
     
     # Check for Java/Spring
-    if (repo_path / "pom.xml").exists():
+    if 'pom.xml' in root_files:
         frameworks.append('Java/Maven')
-    if (repo_path / "build.gradle").exists():
+    if 'build.gradle' in root_files:
         frameworks.append('Java/Gradle')
     
     return ', '.join(frameworks) if frameworks else 'Unknown'
 
-def find_entry_points(repo_path: Path) -> List[str]:
+def find_entry_points(root_files: set, src_files: set, public_files: set,
+                      package_data: Optional[dict]) -> List[str]:
     """Find entry points in the repository"""
     entry_points = []
     
     # Check package.json scripts first (most reliable for JS/TS projects)
-    package_json = repo_path / "package.json"
-    if package_json.exists():
-        try:
-            with open(package_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                scripts = data.get('scripts', {})
-                if 'start' in scripts:
-                    entry_points.append(f"npm start")
-                if 'dev' in scripts:
-                    entry_points.append(f"npm run dev")
-                if 'build' in scripts:
-                    entry_points.append(f"npm run build")
-                    
-                # Check main field
-                if 'main' in data:
-                    entry_points.append(f"Entry: {data['main']}")
-        except Exception as e:
-            pass
+    if package_data is not None:
+        scripts = _json_mapping(package_data, 'scripts')
+        if 'start' in scripts:
+            entry_points.append(f"npm start")
+        if 'dev' in scripts:
+            entry_points.append(f"npm run dev")
+        if 'build' in scripts:
+            entry_points.append(f"npm run build")
+            
+        # Check main field
+        if 'main' in package_data:
+            entry_points.append(f"Entry: {package_data['main']}")
     
     # Common entry point files at root
-    common_entries = [
-        'index.js', 'index.ts', 'index.jsx', 'index.tsx',
-        'main.py', 'app.py', 'server.py', 'manage.py',
-        'main.go', 'main.java', 'Main.java',
-        'index.html'
-    ]
-    
-    for entry in common_entries:
-        if (repo_path / entry).exists():
+    for entry in COMMON_ENTRIES:
+        if entry in root_files:
             entry_points.append(entry)
     
     # Check for src directory entries
-    src_dir = repo_path / "src"
-    if src_dir.exists():
-        src_entries = ['index.js', 'index.ts', 'index.jsx', 'index.tsx', 'App.js', 'App.tsx', 'main.py', 'main.go']
-        for entry in src_entries:
-            src_entry = src_dir / entry
-            if src_entry.exists():
-                rel_name = f"src/{entry}"
-                if rel_name not in entry_points and entry not in entry_points:
-                    entry_points.append(rel_name)
+    for entry in SRC_ENTRIES:
+        if entry in src_files:
+            rel_name = f"src/{entry}"
+            if rel_name not in entry_points and entry not in entry_points:
+                entry_points.append(rel_name)
     
     # Check for public/index.html (common in React apps)
-    public_index = repo_path / "public" / "index.html"
-    if public_index.exists():
+    if 'index.html' in public_files:
         entry_points.append("public/index.html")
     
     return entry_points if entry_points else ["No entry points detected"]
 
-def parse_imports_python(file_path: Path) -> List[str]:
-    """Parse Python file for imports"""
+def _collect_imports(body: List[ast.stmt], imports: List[str]) -> None:
+    """Collect imports from a statement list, descending only into try/if blocks"""
+    for node in body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.append(alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                imports.append(node.module)
+        elif isinstance(node, ast.If):
+            # e.g. `if TYPE_CHECKING:` or version-dependent imports
+            _collect_imports(node.body, imports)
+            _collect_imports(node.orelse, imports)
+        elif isinstance(node, ast.Try):
+            # e.g. `try: import cPickle except ImportError: import pickle`
+            _collect_imports(node.body, imports)
+            for handler in node.handlers:
+                _collect_imports(handler.body, imports)
+            _collect_imports(node.orelse, imports)
+            _collect_imports(node.finalbody, imports)
+
+def parse_imports_python(source: bytes, filename: str = '<unknown>') -> List[str]:
+    """Parse Python source for module-level imports"""
     imports = []
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            tree = ast.parse(f.read())
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.append(alias.name)
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.append(node.module)
+        tree = ast.parse(source, filename=filename)
+        _collect_imports(tree.body, imports)
     except:
         pass
     return imports
 
-def parse_imports_js(file_path: Path) -> List[str]:
-    """Parse JavaScript/TypeScript file for imports"""
-    imports = []
+def parse_imports_js(content: str) -> List[str]:
+    """Parse JavaScript/TypeScript source for imports"""
+    # Basic regex-based parsing
+    return _JS_IMPORT_RE.findall(content)
+
+def _parse_imports(path: str, file_ext: str, size: int,
+                   seen: Dict[tuple[str, bytes], List[str]]) -> List[str]:
+    """Read a source file once and parse its imports, reusing results for identical content
+
+    `seen` memoizes results within a single analysis; the persistent content
+    cache is consulted for content not seen yet.
+    """
+    if file_ext == '.py':
+        kind, version = 'py', PY_PARSER_VERSION
+    elif file_ext in JS_EXTENSIONS:
+        kind, version = 'js', _JS_IMPORT_RE.pattern
+    else:
+        return []
+    
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Basic regex-based parsing
-            import re
-            # Match ES6 imports
-            es6_pattern = r'import\s+.*?from\s+[\'"]([^\'"]+)[\'"]'
-            imports.extend(re.findall(es6_pattern, content))
-            # Match require statements
-            require_pattern = r'require\([\'"]([^\'"]+)[\'"]\)'
-            imports.extend(re.findall(require_pattern, content))
+        with open(path, 'rb') as f:
+            data = f.read(size)
     except:
-        pass
+        return []
+    # Skip empty and binary files
+    if not data or b'\x00' in data[:4096]:
+        return []
+    
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    imports = seen.get((kind, key))
+    if imports is not None:
+        return imports
+    
+    cached = import_cache.get(kind, key, version)
+    if cached is not None:
+        seen[(kind, key)] = cached
+        return cached
+    
+    if kind == 'py':
+        imports = parse_imports_python(data, filename=path)
+    else:
+        imports = parse_imports_js(data.decode('utf-8', errors='ignore'))
+    seen[(kind, key)] = imports
+    import_cache.set(kind, key, imports, version)
     return imports
 
-def analyze_file_structure(repo_path: Path) -> tuple[List[FileNode], Dict[str, List[str]]]:
+def _scandir_recursive(path: str, rel_dir: str = ''):
+    """Yield (directory relative to the walk root, file DirEntry) pairs under path, pruning skipped directories"""
+    with os.scandir(path) as it:
+        for entry in it:
+            name = entry.name
+            # Skip hidden files and directories
+            if name.startswith('.') or entry.is_symlink():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                # Skip node_modules, venv, etc. without descending into them
+                if name in SKIP_DIRS:
+                    continue
+                yield from _scandir_recursive(entry.path, os.path.join(rel_dir, name))
+            elif entry.is_file(follow_symlinks=False):
+                yield rel_dir, entry
+
+def analyze_file_structure(entries: List[tuple[str, str, Optional[os.DirEntry]]]) -> tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
     """Analyze repository file structure and dependencies"""
     files = []
     dependencies = {}
+    # Imports by content digest - duplicated files (vendored, copied) are parsed once
+    seen_sources: Dict[tuple[str, bytes], List[str]] = {}
+    
+    def _parse_one(item: tuple[str, str, Optional[os.DirEntry]]) -> tuple[str, str, str, List[str], int]:
+        rel_dir, name, entry = item
+        rel_path = os.path.join(rel_dir, name)
+        file_ext = os.path.splitext(name)[1]
+        
+        # Tracked but not checked out - listed without size or imports
+        if entry is None:
+            return name, rel_path, file_ext, [], 0
+        
+        try:
+            size = entry.stat(follow_symlinks=True).st_size
+        except:
+            size = 0
+        
+        imports = []
+        # Skip huge files (minified bundles, generated code) - no useful imports
+        if file_ext in CODE_EXTENSIONS and size <= MAX_PARSE_SIZE:
+            imports = _parse_imports(entry.path, file_ext, size, seen_sources)
+        
+        return name, rel_path, file_ext, imports, size
     
-    # File extensions to analyze
-    code_extensions = {'.py', '.js', '.jsx', '.ts', '.tsx', '.go', '.java'}
+    # The walk itself is cheap; parsing and stat() run across worker threads
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_parse_one, entries, chunksize=16))
     
-    for file_path in repo_path.rglob('*'):
-        if file_path.is_file():
-            # Skip hidden files and directories
-            if any(part.startswith('.') for part in file_path.parts):
-                continue
-            # Skip node_modules, venv, etc.
-            if any(skip in file_path.parts for skip in ['node_modules', 'venv', '__pycache__', 'dist', 'build']):
-                continue
-            
-            rel_path = file_path.relative_to(repo_path)
-            file_ext = file_path.suffix
-            
-            imports = []
-            if file_ext in code_extensions:
-                if file_ext == '.py':
-                    imports = parse_imports_python(file_path)
-                elif file_ext in {'.js', '.jsx', '.ts', '.tsx'}:
-                    imports = parse_imports_js(file_path)
-            
-            try:
-                size = file_path.stat().st_size
-            except:
-                size = 0
-            
-            file_node = FileNode(
-                id=str(uuid.uuid4()),
-                name=file_path.name,
-                path=str(rel_path),
-                type=file_ext or 'file',
-                imports=imports,
-                size=size
-            )
-            files.append(file_node)
-            
-            if imports:
-                dependencies[str(rel_path)] = imports
+    # Results come from our own walk, so build plain FileNode-shaped dicts
+    # without validation or per-node uuid draws
+    base_id = uuid.uuid4().hex
+    for i, (name, rel_path, file_ext, imports, size) in enumerate(results):
+        file_node = {
+            'id': f"{base_id}-{i}",
+            'name': name,
+            'path': rel_path,
+            'type': file_ext or 'file',
+            'imports': imports,
+            'size': size
+        }
+        files.append(file_node)
+        
+        if imports:
+            dependencies[rel_path] = imports
     
     return files, dependencies
 
+def _tracked_files(repo: Repo) -> List[str]:
+    """Paths of all files in HEAD, including ones outside the sparse checkout"""
+    # An empty repository has no HEAD commit to list
+    if not repo.head.is_valid():
+        return []
+    output = repo.git.ls_tree('-r', '--name-only', '-z', 'HEAD')
+    return [path for path in output.split('\0') if path]
+
+def scan_repo(repo_path: Path, repo: Optional[Repo] = None) -> tuple[str, List[str], List[tuple[str, str, Optional[os.DirEntry]]]]:
+    """Walk the repository once to detect framework and entry points, collecting files to analyze
+
+    Work items are (relative directory, file name, DirEntry). When the clone's
+    `repo` is given, tracked files left out of the sparse checkout are added
+    with a DirEntry of None so the file listing stays complete.
+    """
+    work = []
+    root_files = set()
+    src_files = set()
+    public_files = set()
+    src_sources = []
+    
+    for parent, entry in _scandir_recursive(str(repo_path)):
+        work.append((parent, entry.name, entry))
+        if not parent:
+            root_files.add(entry.name)
+        elif parent == 'public':
+            public_files.add(entry.name)
+        elif parent == 'src' or parent.startswith('src' + os.sep):
+            if parent == 'src':
+                src_files.add(entry.name)
+            if os.path.splitext(entry.name)[1] in JS_EXTENSIONS:
+                src_sources.append(entry.path)
+    
+    if repo is not None:
+        materialized = {os.path.join(rel_dir, name) for rel_dir, name, _ in work}
+        for path in _tracked_files(repo):
+            parts = path.split('/')
+            # Same pruning as the walk: hidden entries and skipped directories
+            if any(part.startswith('.') for part in parts) or any(part in SKIP_DIRS for part in parts[:-1]):
+                continue
+            rel_dir, name = os.path.join(*parts[:-1]) if len(parts) > 1 else '', parts[-1]
+            if os.path.join(rel_dir, name) not in materialized:
+                work.append((rel_dir, name, None))
+    
+    # package.json feeds both framework and entry point detection - parse it once
+    package_data = None
+    if 'package.json' in root_files:
+        try:
+            package_data = _load_json(repo_path / "package.json")
+        except Exception as e:
+            pass
+        # A manifest that is not a JSON object is treated as absent
+        if not isinstance(package_data, dict):
+            package_data = None
+    
+    framework = detect_framework(repo_path, root_files, package_data, src_sources)
+    entry_points = find_entry_points(root_files, src_files, public_files, package_data)
+    
+    return framework, entry_points, work
+
 async def get_ai_insights(repo_info: dict) -> str:
     """Get AI-powered insights about the repository"""
     try:
@@ -273,19 +536,13 @@ async def get_ai_insights(repo_info: dict) -> str:
         if not api_key:
             return "AI insights unavailable: API key not configured"
         
-        chat = LlmChat(
-            api_key=api_key,
-            session_id=str(uuid.uuid4()),
-            system_message="You are a code analysis expert. Provide clear, concise insights about code repositories."
-        ).with_model("openai", "gpt-4o-mini")
-        
         prompt = f"""Analyze this repository and provide key insights:
 
 Repository: {repo_info['repo_name']}
 Framework: {repo_info['framework']}
 Entry Points: {', '.join(repo_info['entry_points'])}
 Total Files: {repo_info['file_count']}
-Key Dependencies: {', '.join(list(repo_info['dependencies'].keys())[:10])}
+Key Source Files: {', '.join(repo_info['source_files'])}
 
 Provide:
 1. Brief overview of the project structure
@@ -295,89 +552,179 @@ Provide:
 
 Keep it concise and actionable."""
         
+        # Identical repositories produce identical prompts - reuse the previous answer
+        cache_key = hashlib.sha256(prompt.encode('utf-8')).digest()
+        # sqlite calls contend with the parsing threads - keep them off the event loop
+        cached = await asyncio.to_thread(import_cache.get, 'insights', cache_key, f"{LLM_PROVIDER}/{LLM_MODEL}")
+        if cached is not None:
+            return cached
+        
+        # A fresh chat per request on purpose: LlmChat keeps the conversation
+        # for its session, so a shared instance would mix prompts between
+        # analyses. HTTP connections are pooled by the underlying client.
+        chat = LlmChat(
+            api_key=api_key,
+            session_id=str(uuid.uuid4()),
+            system_message="You are a code analysis expert. Provide clear, concise insights about code repositories."
+        ).with_model(LLM_PROVIDER, LLM_MODEL)
+        
         message = UserMessage(text=prompt)
         response = await chat.send_message(message)
+        await asyncio.to_thread(import_cache.set, 'insights', cache_key, response, f"{LLM_PROVIDER}/{LLM_MODEL}")
         return response
     except Exception as e:
         return f"AI insights unavailable: {str(e)}"
 
+def _to_response(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Make a stored analysis JSON-ready in the RepositoryAnalysis shape"""
+    response = {k: v for k, v in analysis.items() if k != 'file_count'}
+    response['timestamp'] = analysis['timestamp'].isoformat()
+    return response
+
+def remember_analysis(analysis: Dict[str, Any], age: float = 0.0) -> None:
+    """Keep an analysis (already `age` seconds old) in the in-process LRU, dropping expired entries"""
+    now = time.monotonic()
+    for url, (stored_at, _) in list(_recent_analyses.items()):
+        if now - stored_at >= ANALYSIS_TTL_SECONDS:
+            del _recent_analyses[url]
+    _recent_analyses[analysis['github_url']] = (now - age, analysis)
+    _recent_analyses.move_to_end(analysis['github_url'])
+    while len(_recent_analyses) > MAX_RECENT_ANALYSES:
+        _recent_analyses.popitem(last=False)
+
+def recall_analysis(github_url: str) -> Optional[Dict[str, Any]]:
+    """Return an analysis of the URL from the in-process LRU if it is within the TTL"""
+    cached = _recent_analyses.get(github_url)
+    if cached is None:
+        return None
+    if time.monotonic() - cached[0] >= ANALYSIS_TTL_SECONDS:
+        del _recent_analyses[github_url]
+        return None
+    _recent_analyses.move_to_end(github_url)
+    return cached[1]
+
+async def find_recent_analysis(github_url: str) -> Optional[Dict[str, Any]]:
+    """Return an analysis of the same URL made within the TTL, if any"""
+    cached = recall_analysis(github_url)
+    if cached is not None:
+        return cached
+    
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=ANALYSIS_TTL_SECONDS)
+    doc = await db.repository_analyses.find_one(
+        {'github_url': github_url, 'timestamp': {'$gte': cutoff}},
+        {'_id': 0},
+        sort=[('timestamp', -1)]
+    )
+    if doc is None:
+        return None
+    
+    if 'file_structure' not in doc:
+        doc['file_structure'] = await db.repo_files.find(
+            {'analysis_id': doc['id']}, {'_id': 0, 'analysis_id': 0}
+        ).to_list(None)
+    analysis = _to_response(doc)
+    remember_analysis(analysis, (datetime.now(timezone.utc) - doc['timestamp']).total_seconds())
+    return analysis
+
 # Routes
 @api_router.get("/")
 async def root():
     return {"message": "Git Repository Analyzer API"}
 
-@api_router.post("/analyze", response_model=RepositoryAnalysis)
-async def analyze_repository(request: AnalyzeRequest):
+# The payload is built as a plain dict and returned directly - RepositoryAnalysis
+# only documents the response shape, so it is not validated and dumped again
+@api_router.post("/analyze", response_model=None, responses={200: {"model": RepositoryAnalysis}})
+async def analyze_repository(request: AnalyzeRequest) -> JSONResponse:
     """Analyze a GitHub repository"""
-    temp_dir = None
-    try:
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp()
-        repo_path = Path(temp_dir)
+    # Reuse a recent analysis of the same repository
+    recent = await find_recent_analysis(request.github_url)
+    if recent is not None:
+        return JSONResponse(recent)
+    
+    # Extract repo name
+    repo_name = request.github_url.rstrip('/').split('/')[-1].replace('.git', '')
+    
+    # The cached clone of this URL is only touched by one analysis at a time
+    clone_key = clone_cache_key(request.github_url)
+    repo_path = CLONE_CACHE_DIR / clone_key
+    async with _clone_lock(clone_key):
+        # A concurrent request for the same URL may have finished while we waited
+        recent = recall_analysis(request.github_url)
+        if recent is not None:
+            return JSONResponse(recent)
         
-        # Clone repository
+        # Clone repository, or bring the cached clone up to date
         try:
-            Repo.clone_from(request.github_url, repo_path, depth=1)
+            repo = await asyncio.to_thread(checkout_repository, request.github_url, repo_path)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Failed to clone repository: {str(e)}")
         
-        # Extract repo name
-        repo_name = request.github_url.rstrip('/').split('/')[-1].replace('.git', '')
-        
-        # Detect framework
-        framework = detect_framework(repo_path)
+        # Detect framework and entry points in a single walk, off the event
+        # loop so other requests keep being served
+        framework, entry_points, work = await asyncio.to_thread(scan_repo, repo_path, repo)
         
-        # Find entry points
-        entry_points = find_entry_points(repo_path)
-        
-        # Analyze file structure
-        file_structure, dependencies = analyze_file_structure(repo_path)
-        
-        # Get AI insights
-        ai_insights = await get_ai_insights({
+        # The walk is enough to prompt for AI insights - request them while
+        # the files are parsed
+        source_files = [
+            os.path.join(rel_dir, name) for rel_dir, name, _ in work
+            if os.path.splitext(name)[1] in CODE_EXTENSIONS
+        ][:KEY_SOURCE_FILES]
+        ai_task = asyncio.create_task(get_ai_insights({
             'repo_name': repo_name,
             'framework': framework,
             'entry_points': entry_points,
-            'file_count': len(file_structure),
-            'dependencies': dependencies
-        })
+            'file_count': len(work),
+            'source_files': source_files
+        }))
         
-        # Create analysis object
-        analysis = RepositoryAnalysis(
-            github_url=request.github_url,
-            repo_name=repo_name,
-            framework=framework,
-            entry_points=entry_points,
-            file_structure=file_structure,
-            dependencies=dependencies,
-            ai_insights=ai_insights
+        # Analyze file structure
+        try:
+            file_structure, dependencies = await asyncio.to_thread(analyze_file_structure, work)
+        except BaseException:
+            ai_task.cancel()
+            raise
+    
+    # Trim the clone cache in the background - the response does not wait on it
+    _run_in_background(evict_stale_clones())
+    
+    ai_insights = await ai_task
+    
+    # Create analysis payload
+    analysis = {
+        'id': str(uuid.uuid4()),
+        'github_url': request.github_url,
+        'repo_name': repo_name,
+        'framework': framework,
+        'entry_points': entry_points,
+        'file_structure': file_structure,
+        'dependencies': dependencies,
+        'ai_insights': ai_insights,
+        'timestamp': datetime.now(timezone.utc)
+    }
+    
+    # Save to database - files go to their own collection so large
+    # repositories cannot exceed the 16 MB document limit
+    doc = {k: v for k, v in analysis.items() if k != 'file_structure'}
+    doc['file_count'] = len(file_structure)
+    
+    await db.repository_analyses.insert_one(doc)
+    if file_structure:
+        await db.repo_files.insert_many(
+            [{'analysis_id': analysis['id'], **f} for f in file_structure],
+            ordered=False
         )
-        
-        # Save to database
-        doc = analysis.model_dump()
-        doc['timestamp'] = doc['timestamp'].isoformat()
-        doc['file_structure'] = [f.model_dump() for f in file_structure]
-        
-        await db.repository_analyses.insert_one(doc)
-        
-        return analysis
-        
-    finally:
-        # Cleanup temporary directory
-        if temp_dir and os.path.exists(temp_dir):
-            try:
-                shutil.rmtree(temp_dir)
-            except:
-                pass
+    
+    response = _to_response(analysis)
+    remember_analysis(response)
+    
+    return JSONResponse(response)
 
 @api_router.get("/history", response_model=List[RepositoryAnalysis])
 async def get_analysis_history():
     """Get analysis history"""
-    analyses = await db.repository_analyses.find({}, {"_id": 0}).sort("timestamp", -1).limit(20).to_list(20)
-    
-    for analysis in analyses:
-        if isinstance(analysis['timestamp'], str):
-            analysis['timestamp'] = datetime.fromisoformat(analysis['timestamp'])
+    analyses = await db.repository_analyses.find(
+        {}, {"_id": 0, "file_structure": 0, "dependencies": 0}
+    ).sort("timestamp", -1).limit(20).to_list(20)
     
     return analyses
 
@@ -399,6 +746,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def create_db_indexes():
+    await db.repo_files.create_index("analysis_id")
+    await db.repository_analyses.create_index([("github_url", 1), ("timestamp", -1)])
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+    import_cache.close()
\ No newline at end of file
@@ -0,0 +1,66 @@
+import os
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+# server.py connects to MongoDB and opens the analysis cache at import time;
+# neither is touched by the helpers under test
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_database")
+os.environ.setdefault("ANALYSIS_CACHE_PATH", ":memory:")
+
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def _stub_llm_chat():
+    """Provide emergentintegrations.llm.chat when the private package is missing
+
+    None of the helpers under test call the LLM; server.py only needs the
+    names to import.
+    """
+    try:
+        import emergentintegrations.llm.chat  # noqa: F401
+        return
+    except ImportError:
+        pass
+
+    class LlmChat:
+        def __init__(self, **kwargs):
+            pass
+
+        def with_model(self, provider, model):
+            return self
+
+        async def send_message(self, message):
+            raise RuntimeError("LLM calls are not available in tests")
+
+    class UserMessage:
+        def __init__(self, text):
+            self.text = text
+
+    chat = types.ModuleType("emergentintegrations.llm.chat")
+    chat.LlmChat = LlmChat
+    chat.UserMessage = UserMessage
+    llm = types.ModuleType("emergentintegrations.llm")
+    llm.chat = chat
+    package = types.ModuleType("emergentintegrations")
+    package.llm = llm
+    sys.modules.update({
+        "emergentintegrations": package,
+        "emergentintegrations.llm": llm,
+        "emergentintegrations.llm.chat": chat,
+    })
+
+
+@pytest.fixture(scope="session")
+def server():
+    pytest.importorskip("fastapi")
+    pytest.importorskip("motor")
+    pytest.importorskip("git")
+    _stub_llm_chat()
+    import server as server_module
+    return server_module
@@ -0,0 +1,19 @@
+import asyncio
+
+
+def test_clone_lock_serializes_and_drops_entry_when_released(server):
+    order = []
+
+    async def hold(name):
+        async with server._clone_lock("key"):
+            order.append(f"{name}-start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name}-end")
+
+    async def main():
+        await asyncio.gather(hold("a"), hold("b"))
+
+    asyncio.run(main())
+
+    assert order == ["a-start", "a-end", "b-start", "b-end"]
+    assert "key" not in server._clone_locks
@@ -0,0 +1,55 @@
+import sqlite3
+
+import _import_cache
+from _import_cache import ContentCache
+
+
+def test_get_returns_value_for_matching_version(tmp_path):
+    cache = ContentCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("py", b"digest", ["os", "sys"], "3.11:2")
+
+    assert cache.get("py", b"digest", "3.11:2") == ["os", "sys"]
+    assert cache.get("py", b"digest", "3.12:2") is None
+    assert cache.get("js", b"digest", "3.11:2") is None
+    cache.close()
+
+
+def test_unopenable_path_behaves_as_empty_cache(tmp_path):
+    cache = ContentCache(str(tmp_path / "missing-dir" / "cache.sqlite3"))
+    cache.set("py", b"digest", ["os"])
+
+    assert cache.get("py", b"digest") is None
+    cache.close()
+
+
+def test_old_and_excess_entries_are_pruned_on_open(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ContentCache(path)
+    for i in range(5):
+        monkeypatch.setattr(_import_cache.time, "time", lambda i=i: 1000.0 + i)
+        cache.set("py", bytes([i]), [str(i)])
+    cache.close()
+
+    monkeypatch.setattr(_import_cache.time, "time", lambda: 1004.5)
+    cache = ContentCache(path, max_entries=3, max_age=4.0)
+
+    # Entry 0 is too old; of the rest only the newest three are kept
+    assert [cache.get("py", bytes([i])) for i in range(5)] == [None, None, ["2"], ["3"], ["4"]]
+    cache.close()
+
+
+def test_table_without_timestamps_is_recreated(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE cache (kind TEXT NOT NULL, key BLOB NOT NULL, version TEXT NOT NULL, "
+        "value TEXT NOT NULL, PRIMARY KEY (kind, key))"
+    )
+    conn.commit()
+    conn.close()
+
+    cache = ContentCache(path)
+    cache.set("js", b"digest", ["react"])
+
+    assert cache.get("js", b"digest") == ["react"]
+    cache.close()
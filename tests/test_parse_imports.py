@@ -0,0 +1,64 @@
+def test_python_module_level_and_conditional_imports(server):
+    source = b"""
+import os
+from pathlib import Path
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+if TYPE_CHECKING:
+    from typing import List
+elif sys.version_info < (3, 8):
+    import importlib_metadata
+else:
+    import importlib.metadata
+
+def load():
+    import json
+
+class Loader:
+    from collections import OrderedDict
+"""
+    assert server.parse_imports_python(source) == [
+        "os", "pathlib", "cPickle", "pickle", "typing", "importlib_metadata", "importlib.metadata"
+    ]
+
+
+def test_python_relative_import_without_module_and_syntax_error(server):
+    assert server.parse_imports_python(b"from . import sibling\nfrom .pkg import mod\n") == ["pkg"]
+    assert server.parse_imports_python(b"import (\n") == []
+
+
+
+def test_js_multiline_named_import(server):
+    source = """import {
+  useState,
+  useEffect,
+} from 'react';
+import Button from "./Button";
+"""
+    assert server.parse_imports_js(source) == ["react", "./Button"]
+
+
+def test_js_require_with_spaces(server):
+    assert server.parse_imports_js("const x = require( 'lodash' );\nconst y = require(\"fs\")") == ["lodash", "fs"]
+
+
+def test_js_without_semicolons(server):
+    # The side-effect CSS import has no `from`; its match runs on to the next
+    # statement's source, so each module is still reported once
+    source = """import './styles.css'
+import React from 'react'
+import { a } from './a'
+const path = require('path')
+export default function App() {}
+"""
+    assert server.parse_imports_js(source) == ["react", "./a", "path"]
+
+
+def test_js_import_without_from_scans_in_linear_time(server):
+    # Each `import` lacks a `from`, so every match attempt runs to the end of
+    # the file; a backtracking engine takes tens of seconds on this input
+    source = "import x\n" * 20000
+
+    assert server.parse_imports_js(source) == []
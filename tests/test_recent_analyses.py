@@ -0,0 +1,28 @@
+import pytest
+
+
+@pytest.fixture
+def recent(server):
+    server._recent_analyses.clear()
+    yield server
+    server._recent_analyses.clear()
+
+
+def test_remember_analysis_is_bounded_lru(recent):
+    for i in range(recent.MAX_RECENT_ANALYSES + 1):
+        recent.remember_analysis({"github_url": f"url-{i}"})
+        if i == 0:
+            continue
+        # Keep the first URL recently used so the second one is evicted instead
+        assert recent.recall_analysis("url-0") is not None
+
+    assert len(recent._recent_analyses) == recent.MAX_RECENT_ANALYSES
+    assert recent.recall_analysis("url-1") is None
+    assert recent.recall_analysis(f"url-{recent.MAX_RECENT_ANALYSES}") is not None
+
+
+def test_recall_analysis_drops_expired_entries(recent):
+    recent.remember_analysis({"github_url": "old"}, age=recent.ANALYSIS_TTL_SECONDS)
+
+    assert recent.recall_analysis("old") is None
+    assert "old" not in recent._recent_analyses
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+
+def write(root, rel_path, content=""):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def test_scan_repo_detects_framework_and_entry_points(server, tmp_path):
+    write(tmp_path, "package.json", '{"dependencies": {"react": "18"}, "scripts": {"start": "x"}}')
+    write(tmp_path, "src/index.js", "import React from 'react'")
+    write(tmp_path, "public/index.html")
+    write(tmp_path, "node_modules/lib/index.js")
+    write(tmp_path, ".hidden/secret.py")
+
+    framework, entry_points, work = server.scan_repo(tmp_path)
+
+    assert framework == "React"
+    assert entry_points == ["npm start", "src/index.js", "public/index.html"]
+    assert sorted(os.path.join(rel_dir, name) for rel_dir, name, _ in work) == [
+        "package.json", os.path.join("public", "index.html"), os.path.join("src", "index.js")
+    ]
+
+
+def test_scan_repo_react_fallback_from_src(server, tmp_path):
+    write(tmp_path, "src/components/App.jsx", "import React from 'react'")
+
+    framework, entry_points, _ = server.scan_repo(tmp_path)
+
+    assert framework == "React"
+    assert entry_points == ["No entry points detected"]
+
+
+@pytest.mark.parametrize("manifest", [
+    '{"dependencies": null, "devDependencies": null, "scripts": null}',
+    '{"dependencies": ["react"], "scripts": "npm start"}',
+    '[1, 2, 3]',
+    '"just a string"',
+    '{not json',
+])
+def test_scan_repo_ignores_malformed_package_json(server, tmp_path, manifest):
+    write(tmp_path, "package.json", manifest)
+
+    framework, entry_points, _ = server.scan_repo(tmp_path)
+
+    assert framework == "Unknown"
+    assert entry_points == ["No entry points detected"]
+
+
+def test_scan_repo_lists_tracked_files_outside_the_checkout(server, tmp_path):
+    git = pytest.importorskip("git")
+    write(tmp_path, "app.py", "import os")
+    write(tmp_path, "README.md", "# readme")
+    write(tmp_path, "docs/guide.md", "guide")
+    write(tmp_path, ".github/workflow.yml")
+    write(tmp_path, "node_modules/lib/README.md")
+    repo = git.Repo.init(tmp_path)
+    repo.index.add(["app.py", "README.md", "docs/guide.md", ".github/workflow.yml", "node_modules/lib/README.md"])
+    repo.index.commit("initial", author=git.Actor("a", "a@example.com"), committer=git.Actor("a", "a@example.com"))
+    # Simulate a sparse checkout that only materialized the source file
+    for rel_path in ["README.md", "docs/guide.md"]:
+        (tmp_path / rel_path).unlink()
+
+    _, entry_points, work = server.scan_repo(tmp_path, repo)
+    files, dependencies = server.analyze_file_structure(work)
+
+    assert entry_points == ["app.py"]
+    assert sorted((f["path"], f["size"]) for f in files) == [
+        ("README.md", 0), ("app.py", 9), (os.path.join("docs", "guide.md"), 0)
+    ]
+    assert dependencies == {"app.py": ["os"]}
+
+
+def test_scan_repo_on_empty_repository(server, tmp_path):
+    git = pytest.importorskip("git")
+    repo = git.Repo.init(tmp_path)
+
+    framework, entry_points, work = server.scan_repo(tmp_path, repo)
+
+    assert framework == "Unknown"
+    assert entry_points == ["No entry points detected"]
+    assert work == []